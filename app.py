@@ -1,386 +1,518 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory
-import pandas as pd
-import plotly.graph_objs as go
-import plotly.utils
-import json
-import os
-from datetime import datetime
-import google.generativeai as genai
-import numpy as np
-from werkzeug.utils import secure_filename
-from dotenv import load_dotenv
-
-app = Flask(__name__)
-app.config['UPLOAD_FOLDER'] = 'uploads'
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Create uploads directory if it doesn't exist
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-
-# Configure Gemini API
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-if not GEMINI_API_KEY:
-    raise ValueError("GEMINI_API_KEY not found in environment variables. Please check your .env file.")
-
-genai.configure(api_key=GEMINI_API_KEY)
-# Try to use the latest model, fallback to gemini-pro if not available
-try:
-    model = genai.GenerativeModel('gemini-2.0-flash-exp')
-except:
-    try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
-    except:
-        model = genai.GenerativeModel('gemini-pro')
-
-# Global variable to store current data
-current_data = None
-
-def convert_to_json_serializable(obj):
-    """Convert numpy types to JSON serializable types"""
-    if hasattr(obj, 'item'):
-        return obj.item()
-    elif hasattr(obj, 'tolist'):
-        return obj.tolist()
-    else:
-        return obj
-
-class FinancialAnalyzer:
-    def __init__(self, df):
-        self.df = df
-        self.df['Month'] = pd.to_datetime(self.df['Month'])
-        
-    def get_income_trend(self):
-        """Generate income trend chart"""
-        fig = go.Figure()
-        
-        # Convert to JSON serializable types
-        x_values = [str(date) for date in self.df['Month'].dt.strftime('%Y-%m')]
-        y_values = [float(val) for val in self.df['Income']]
-        
-        fig.add_trace(go.Scatter(
-            x=x_values,
-            y=y_values,
-            mode='lines+markers',
-            name='Income',
-            line=dict(color='#2E8B57', width=3)
-        ))
-        fig.update_layout(
-            title='Monthly Income Trend',
-            xaxis_title='Month',
-            yaxis_title='Amount (₹)',
-            template='plotly_white'
-        )
-        return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
-    
-    def get_expense_breakdown(self):
-        """Generate expense breakdown pie chart"""
-        expense_columns = ['Rent', 'Utilities', 'Insurance', 'Loan_Payments', 
-                          'Groceries', 'Transportation', 'Entertainment', 
-                          'Healthcare', 'Shopping', 'Dining_Out', 'Subscriptions']
-        
-        total_expenses = self.df[expense_columns].sum()
-        
-        # Convert to JSON serializable types
-        labels = [str(label) for label in total_expenses.index]
-        values = [float(val) for val in total_expenses.values]
-        
-        fig = go.Figure(data=[go.Pie(
-            labels=labels,
-            values=values,
-            hole=0.3
-        )])
-        fig.update_layout(
-            title='Annual Expense Breakdown',
-            template='plotly_white'
-        )
-        return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
-    
-    def get_monthly_expenses(self):
-        """Generate monthly expenses bar chart"""
-        fig = go.Figure()
-        
-        expense_columns = ['Rent', 'Utilities', 'Insurance', 'Loan_Payments', 
-                          'Groceries', 'Transportation', 'Entertainment', 
-                          'Healthcare', 'Shopping', 'Dining_Out', 'Subscriptions']
-        
-        for col in expense_columns:
-            # Convert to JSON serializable types
-            x_values = [str(date) for date in self.df['Month'].dt.strftime('%Y-%m')]
-            y_values = [float(val) for val in self.df[col]]
-            
-            fig.add_trace(go.Bar(
-                name=col,
-                x=x_values,
-                y=y_values
-            ))
-        
-        fig.update_layout(
-            title='Monthly Expenses by Category',
-            xaxis_title='Month',
-            yaxis_title='Amount (₹)',
-            barmode='stack',
-            template='plotly_white'
-        )
-        return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
-    
-    def get_savings_analysis(self):
-        """Generate savings and investment analysis"""
-        fig = go.Figure()
-        
-        # Convert to JSON serializable types
-        x_values = [str(date) for date in self.df['Month'].dt.strftime('%Y-%m')]
-        savings_values = [float(val) for val in self.df['Savings']]
-        investment_values = [float(val) for val in self.df['Investments']]
-        
-        fig.add_trace(go.Scatter(
-            x=x_values,
-            y=savings_values,
-            mode='lines+markers',
-            name='Savings',
-            line=dict(color='#4169E1', width=3)
-        ))
-        
-        fig.add_trace(go.Scatter(
-            x=x_values,
-            y=investment_values,
-            mode='lines+markers',
-            name='Investments',
-            line=dict(color='#FF6347', width=3)
-        ))
-        
-        fig.update_layout(
-            title='Savings and Investments Trend',
-            xaxis_title='Month',
-            yaxis_title='Amount (₹)',
-            template='plotly_white'
-        )
-        return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
-    
-    def get_net_income_trend(self):
-        """Generate net income trend"""
-        fig = go.Figure()
-        
-        # Convert to JSON serializable types
-        x_values = [str(date) for date in self.df['Month'].dt.strftime('%Y-%m')]
-        y_values = [float(val) for val in self.df['Net_Income']]
-        
-        fig.add_trace(go.Scatter(
-            x=x_values,
-            y=y_values,
-            mode='lines+markers',
-            name='Net Income',
-            line=dict(color='#32CD32', width=3),
-            fill='tonexty'
-        ))
-        
-        # Add zero line
-        fig.add_hline(y=0, line_dash="dash", line_color="red", 
-                     annotation_text="Break-even Line")
-        
-        fig.update_layout(
-            title='Monthly Net Income Trend',
-            xaxis_title='Month',
-            yaxis_title='Amount (₹)',
-            template='plotly_white'
-        )
-        return json.dumps(fig, cls=plotly.utils.PlotlyJSONEncoder)
-    
-    def get_financial_summary(self):
-        """Generate financial summary statistics"""
-        total_income = float(self.df['Income'].sum())
-        total_expenses = float(self.df['Total_Expenses'].sum())
-        total_savings = float(self.df['Savings'].sum())
-        total_investments = float(self.df['Investments'].sum())
-        
-        # Calculate actual savings rate based on net income
-        # If expenses > income, savings rate should be negative or zero
-        net_income = total_income - total_expenses
-        if net_income > 0:
-            # Positive net income: calculate savings rate as (savings / net_income) * 100
-            actual_savings_rate = float((total_savings / net_income) * 100) if net_income > 0 else 0
-        else:
-            # Negative net income: savings rate is not meaningful, show as 0
-            actual_savings_rate = 0.0
-        
-        # Calculate traditional savings rate (savings / income)
-        traditional_savings_rate = float((total_savings / total_income) * 100) if total_income > 0 else 0
-        
-        summary = {
-            'total_income': total_income,
-            'total_expenses': total_expenses,
-            'total_savings': total_savings,
-            'total_investments': total_investments,
-            'net_income': net_income,
-            'average_monthly_income': float(self.df['Income'].mean()),
-            'average_monthly_expenses': float(self.df['Total_Expenses'].mean()),
-            'average_monthly_savings': float(self.df['Savings'].mean()),
-            'savings_rate': actual_savings_rate,
-            'traditional_savings_rate': traditional_savings_rate,
-            'months_in_deficit': int((self.df['Net_Income'] < 0).sum()),
-            'largest_expense_category': str(self.df[['Rent', 'Utilities', 'Insurance', 'Loan_Payments', 
-                                               'Groceries', 'Transportation', 'Entertainment', 
-                                               'Healthcare', 'Shopping', 'Dining_Out', 'Subscriptions']].sum().idxmax())
-        }
-        return summary
-
-def generate_financial_advice(data_summary, user_question):
-    """Generate financial advice using Gemini AI"""
-    try:
-        context = f"""
-        Financial Data Summary:
-        - Annual Income: ₹{data_summary['total_income']:,.2f}
-        - Annual Expenses: ₹{data_summary['total_expenses']:,.2f}
-        - Net Income: ₹{data_summary['net_income']:,.2f}
-        - Savings: ₹{data_summary['total_savings']:,.2f}
-        - Investments: ₹{data_summary['total_investments']:,.2f}
-        - Savings Rate: {data_summary['savings_rate']:.1f}%
-        - Months in Deficit: {data_summary['months_in_deficit']}
-        - Largest Expense: {data_summary['largest_expense_category']}
-        
-        Please provide structured, concise financial advice. Format your response as:
-        
-        ## 🎯 **Key Issues**
-        - List 2-3 main problems
-        
-        ## 💡 **Immediate Actions** 
-        - 3-4 specific steps to take now
-        
-        ## 📊 **Budget Recommendations**
-        - Specific expense reduction targets
-        - Income improvement suggestions
-        
-        ## 🎯 **Next Steps**
-        - 2-3 follow-up actions
-        
-        Keep each section brief and actionable. Use bullet points and be specific with amounts and percentages.
-        """
-        
-        prompt = f"{context}\n\nUser Question: {user_question}\n\nPlease provide detailed financial advice and recommendations:"
-        
-        # Try different models in order of preference
-        models_to_try = ['gemini-2.0-flash-exp', 'gemini-1.5-flash', 'gemini-pro', 'gemini-1.5-pro']
-        
-        for model_name in models_to_try:
-            try:
-                current_model = genai.GenerativeModel(model_name)
-                response = current_model.generate_content(prompt)
-                return response.text
-            except Exception as model_error:
-                print(f"Model {model_name} failed: {str(model_error)}")
-                continue
-        
-        # If all models fail, return a basic response
-        return f"""## 🎯 **Key Issues**
-- {'Spending ₹' + str(abs(data_summary['net_income'])) + ' more than you earn annually' if data_summary['net_income'] < 0 else 'Living within your means'}
-- {data_summary['months_in_deficit']} months in deficit spending
-- Largest expense: {data_summary['largest_expense_category']}
-
-## 💡 **Immediate Actions**
-- Reduce {data_summary['largest_expense_category']} expenses by 15-20%
-- Create a detailed monthly budget
-- Track every expense for 30 days
-- Look for ways to increase income
-
-## 📊 **Budget Recommendations**
-- Target: Reduce expenses by ₹{abs(data_summary['net_income']) + 10000:,.0f} annually
-- Focus on: {data_summary['largest_expense_category']} optimization
-- Build emergency fund: 3-6 months expenses
-
-## 🎯 **Next Steps**
-- Set up expense tracking app
-- Review and negotiate {data_summary['largest_expense_category']} costs
-- Explore additional income sources
-
-*Note: AI service temporarily unavailable. This is basic guidance based on your data.*"""
-        
-    except Exception as e:
-        return f"Sorry, I encountered an error while generating advice: {str(e)}"
-
-@app.route('/')
-def index():
-    return render_template('index.html')
-
-@app.route('/upload', methods=['POST'])
-def upload_file():
-    global current_data
-    
-    if 'file' not in request.files:
-        return jsonify({'error': 'No file uploaded'}), 400
-    
-    file = request.files['file']
-    if file.filename == '':
-        return jsonify({'error': 'No file selected'}), 400
-    
-    if file and file.filename.endswith('.csv'):
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
-        try:
-            current_data = pd.read_csv(filepath)
-            return jsonify({'message': 'File uploaded successfully', 'rows': len(current_data)})
-        except Exception as e:
-            return jsonify({'error': f'Error reading CSV file: {str(e)}'}), 400
-    else:
-        return jsonify({'error': 'Please upload a CSV file'}), 400
-
-@app.route('/analyze')
-def analyze_data():
-    global current_data
-    
-    if current_data is None:
-        return jsonify({'error': 'No data available. Please upload a CSV file first.'}), 400
-    
-    try:
-        analyzer = FinancialAnalyzer(current_data)
-        
-        analysis = {
-            'income_trend': analyzer.get_income_trend(),
-            'expense_breakdown': analyzer.get_expense_breakdown(),
-            'monthly_expenses': analyzer.get_monthly_expenses(),
-            'savings_analysis': analyzer.get_savings_analysis(),
-            'net_income_trend': analyzer.get_net_income_trend(),
-            'summary': analyzer.get_financial_summary()
-        }
-        
-        return jsonify(analysis)
-    except Exception as e:
-        return jsonify({'error': f'Error analyzing data: {str(e)}'}), 500
-
-@app.route('/chat', methods=['POST'])
-def chat():
-    global current_data
-    
-    if current_data is None:
-        return jsonify({'error': 'No data available. Please upload a CSV file first.'}), 400
-    
-    data = request.get_json()
-    user_question = data.get('question', '')
-    
-    if not user_question:
-        return jsonify({'error': 'No question provided'}), 400
-    
-    try:
-        analyzer = FinancialAnalyzer(current_data)
-        summary = analyzer.get_financial_summary()
-        advice = generate_financial_advice(summary, user_question)
-        
-        return jsonify({'response': advice})
-    except Exception as e:
-        return jsonify({'error': f'Error generating response: {str(e)}'}), 500
-
-@app.route('/load_sample')
-def load_sample_data():
-    global current_data
-    
-    try:
-        current_data = pd.read_csv('financial_data.csv')
-        return jsonify({'message': 'Sample data loaded successfully', 'rows': len(current_data)})
-    except Exception as e:
-        return jsonify({'error': f'Error loading sample data: {str(e)}'}), 500
-
-if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+from flask import Flask, render_template, request, jsonify, send_from_directory, session
+import pandas as pd
+import plotly.io as pio
+import orjson
+import os
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
+import google.generativeai as genai
+import numpy as np
+from werkzeug.utils import secure_filename
+from dotenv import load_dotenv
+
+try:
+    # pybase64 is a drop-in, ~2-3x faster encoder; fall back to stdlib
+    from pybase64 import b64encode
+except ImportError:
+    from base64 import b64encode
+
+app = Flask(__name__)
+app.config['UPLOAD_FOLDER'] = 'uploads'
+app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Session cookie stores which cached dataset a client is working with
+app.secret_key = os.getenv('FLASK_SECRET_KEY') or os.urandom(24)
+
+# Create uploads directory if it doesn't exist
+os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+
+# Configure Gemini API
+GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+if not GEMINI_API_KEY:
+    raise ValueError("GEMINI_API_KEY not found in environment variables. Please check your .env file.")
+
+genai.configure(api_key=GEMINI_API_KEY)
+# Candidate Gemini models in order of preference; the first one that
+# answers a request is cached in active_model so later chat calls skip
+# probing dead models entirely
+MODELS_TO_TRY = ('gemini-2.0-flash-exp', 'gemini-1.5-flash', 'gemini-pro', 'gemini-1.5-pro')
+active_model = None
+
+# Datasets are cached per content hash so repeated analyze/chat calls
+# (and re-uploads of the same file) reuse the parsed frame, the analyzer
+# with its precomputed aggregates, and the prerendered charts. LRU
+# eviction keeps memory bounded across concurrent users.
+MAX_CACHED_DATASETS = 8
+dataset_cache = OrderedDict()
+# Cookieless clients only ever fall back to the public sample dataset;
+# uploaded data stays reachable solely through the owner's session
+sample_dataset_hash = None
+
+# Expense categories shared by the charts, summary and CSV loader;
+# immutable so every call site references the same constant
+EXPENSE_COLUMNS = ('Rent', 'Utilities', 'Insurance', 'Loan_Payments',
+                   'Groceries', 'Transportation', 'Entertainment',
+                   'Healthcare', 'Shopping', 'Dining_Out', 'Subscriptions')
+
+# Known numeric columns; explicit dtypes let the C parser decode the file
+# in one pass instead of inferring types column-by-column
+CSV_DTYPES = {col: 'float64' for col in EXPENSE_COLUMNS +
+              ('Income', 'Savings', 'Investments', 'Total_Expenses', 'Net_Income')}
+
+# Figures are emitted as raw spec dicts, so the named template has to be
+# resolved server-side once; plotly.js cannot look up 'plotly_white' itself
+PLOTLY_WHITE = pio.templates['plotly_white'].to_plotly_json()
+
+# Layout settings every chart shares; merged into each spec with a single
+# dict copy instead of per-figure template application
+BASE_LAYOUT = {'template': PLOTLY_WHITE}
+
+def typed_array(values):
+    """Encode a numeric column as Plotly's base64 typed-array spec
+
+    plotly.js decodes {'dtype', 'bdata'} natively; the base64 blob is
+    far smaller than a JSON float array and skips per-element encoding.
+    float32 keeps ~7 significant digits, plenty for amounts rendered at
+    2-decimal precision, and halves the bytes on the wire.
+    """
+    arr = np.ascontiguousarray(values, dtype=np.float32)
+    return {'dtype': 'f4', 'bdata': b64encode(arr.tobytes()).decode('ascii')}
+
+def load_financial_csv(filepath):
+    """Read a financial CSV with explicit dtypes and Month parsed at read time"""
+    return pd.read_csv(filepath, dtype=CSV_DTYPES, parse_dates=['Month'],
+                       cache_dates=True, engine='c')
+
+def load_financial_data(filepath):
+    """Load financial data, preferring a Parquet sidecar over re-parsing the CSV"""
+    parquet_path = filepath + '.parquet'
+    if (os.path.exists(parquet_path) and
+            os.path.getmtime(parquet_path) >= os.path.getmtime(filepath)):
+        return pd.read_parquet(parquet_path)
+    df = load_financial_csv(filepath)
+    try:
+        df.to_parquet(parquet_path, index=False)
+    except Exception:
+        # The sidecar is only a cache; fall back to CSV parsing next time
+        pass
+    return df
+
+def cache_dataset(file_hash, df):
+    """Register a parsed dataset under its content hash and select it for this session"""
+    entry = dataset_cache.get(file_hash)
+    if entry is None:
+        entry = {'df': df, 'analyzer': FinancialAnalyzer(df), 'analysis': None}
+        dataset_cache[file_hash] = entry
+    dataset_cache.move_to_end(file_hash)
+    while len(dataset_cache) > MAX_CACHED_DATASETS:
+        dataset_cache.popitem(last=False)
+    session['dataset'] = file_hash
+    return entry
+
+def get_current_dataset():
+    """Look up the cached dataset for this request (query arg, session, or the sample)"""
+    file_hash = (request.args.get('dataset') or session.get('dataset')
+                 or sample_dataset_hash)
+    entry = dataset_cache.get(file_hash)
+    if entry is not None:
+        dataset_cache.move_to_end(file_hash)
+    return entry
+
+class FinancialAnalyzer:
+    def __init__(self, df):
+        self.df = df
+        # Reject unusable CSVs up front with a clear message; only the
+        # Total_Expenses/Net_Income columns can be derived from the rest
+        missing = [col for col in ('Month', 'Income') + EXPENSE_COLUMNS +
+                   ('Savings', 'Investments') if col not in df.columns]
+        if missing:
+            raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+        # Precompute shared intermediates once; several chart/summary
+        # methods would otherwise recompute the same aggregates per call
+        # Month-resolution datetime64 renders straight to 'YYYY-MM' in one
+        # vectorized call, skipping per-row strftime dispatch
+        month_starts = self.df['Month'].to_numpy().astype('datetime64[M]')
+        self._months_str = np.datetime_as_string(month_starts).tolist()
+        # pandas column indexing wants a list, not a tuple key
+        self._expense_cols = list(EXPENSE_COLUMNS)
+        self._expense_sum_by_cat = self.df[self._expense_cols].sum()
+        # Derive the total/net columns once (uploaded CSVs may omit them)
+        # and keep the net-income array around for the chart and the
+        # deficit count instead of re-doing column lookups per call
+        if 'Total_Expenses' not in self.df.columns:
+            self.df['Total_Expenses'] = self.df[self._expense_cols].sum(axis=1)
+        if 'Net_Income' not in self.df.columns:
+            self.df['Net_Income'] = self.df['Income'] - self.df['Total_Expenses']
+        self._net_income_arr = self.df['Net_Income'].to_numpy(dtype=np.float64, copy=False)
+        self._income_sum = float(self.df['Income'].sum())
+        self._expenses_sum = float(self.df['Total_Expenses'].sum())
+        self._net_income_sum = self._income_sum - self._expenses_sum
+        self._summary = None
+
+    def get_income_trend(self):
+        """Generate income trend chart"""
+        # Inputs are known-good, so emit the figure spec directly instead
+        # of paying for go.Figure construction and its to_plotly_json copy
+        return dict(
+            data=[dict(
+                type='scatter',
+                x=self._months_str,
+                y=typed_array(self.df['Income']),
+                mode='lines+markers',
+                name='Income',
+                line=dict(color='#2E8B57', width=3)
+            )],
+            layout=dict(
+                BASE_LAYOUT,
+                title=dict(text='Monthly Income Trend'),
+                xaxis=dict(title=dict(text='Month')),
+                yaxis=dict(title=dict(text='Amount (₹)'))
+            )
+        )
+    
+    def get_expense_breakdown(self):
+        """Generate expense breakdown pie chart"""
+        total_expenses = self._expense_sum_by_cat
+
+        return dict(
+            data=[dict(
+                type='pie',
+                labels=total_expenses.index.tolist(),
+                values=typed_array(total_expenses),
+                hole=0.3
+            )],
+            layout=dict(
+                BASE_LAYOUT,
+                title=dict(text='Annual Expense Breakdown')
+            )
+        )
+    
+    def get_monthly_expenses(self):
+        """Generate monthly expenses bar chart"""
+        traces = [dict(
+            type='bar',
+            name=col,
+            x=self._months_str,
+            y=typed_array(self.df[col])
+        ) for col in self._expense_cols]
+
+        return dict(
+            data=traces,
+            layout=dict(
+                BASE_LAYOUT,
+                title=dict(text='Monthly Expenses by Category'),
+                xaxis=dict(title=dict(text='Month')),
+                yaxis=dict(title=dict(text='Amount (₹)')),
+                barmode='stack'
+            )
+        )
+    
+    def get_savings_analysis(self):
+        """Generate savings and investment analysis"""
+        return dict(
+            data=[
+                dict(
+                    type='scatter',
+                    x=self._months_str,
+                    y=typed_array(self.df['Savings']),
+                    mode='lines+markers',
+                    name='Savings',
+                    line=dict(color='#4169E1', width=3)
+                ),
+                dict(
+                    type='scatter',
+                    x=self._months_str,
+                    y=typed_array(self.df['Investments']),
+                    mode='lines+markers',
+                    name='Investments',
+                    line=dict(color='#FF6347', width=3)
+                )
+            ],
+            layout=dict(
+                BASE_LAYOUT,
+                title=dict(text='Savings and Investments Trend'),
+                xaxis=dict(title=dict(text='Month')),
+                yaxis=dict(title=dict(text='Amount (₹)'))
+            )
+        )
+    
+    def get_net_income_trend(self):
+        """Generate net income trend"""
+        return dict(
+            data=[dict(
+                type='scatter',
+                x=self._months_str,
+                y=typed_array(self._net_income_arr),
+                mode='lines+markers',
+                name='Net Income',
+                line=dict(color='#32CD32', width=3),
+                fill='tonexty'
+            )],
+            layout=dict(
+                BASE_LAYOUT,
+                title=dict(text='Monthly Net Income Trend'),
+                xaxis=dict(title=dict(text='Month')),
+                yaxis=dict(title=dict(text='Amount (₹)')),
+                # Zero line, expressed directly as layout shape + annotation
+                # instead of a validated add_hline call
+                shapes=[dict(
+                    type='line', line=dict(dash='dash', color='red'),
+                    xref='x domain', x0=0, x1=1, yref='y', y0=0, y1=0
+                )],
+                annotations=[dict(
+                    text='Break-even Line', showarrow=False,
+                    xref='x domain', x=1, yref='y', y=0,
+                    xanchor='right', yanchor='bottom'
+                )]
+            )
+        )
+    
+    def get_financial_summary(self):
+        """Generate financial summary statistics"""
+        if self._summary is not None:
+            return self._summary
+        total_income = self._income_sum
+        total_expenses = self._expenses_sum
+        total_savings = float(self.df['Savings'].sum())
+        total_investments = float(self.df['Investments'].sum())
+        
+        # Calculate actual savings rate based on net income
+        # If expenses > income, savings rate should be negative or zero
+        net_income = self._net_income_sum
+        if net_income > 0:
+            # Positive net income: calculate savings rate as (savings / net_income) * 100
+            actual_savings_rate = float((total_savings / net_income) * 100) if net_income > 0 else 0
+        else:
+            # Negative net income: savings rate is not meaningful, show as 0
+            actual_savings_rate = 0.0
+        
+        # Calculate traditional savings rate (savings / income)
+        traditional_savings_rate = float((total_savings / total_income) * 100) if total_income > 0 else 0
+        
+        summary = {
+            'total_income': total_income,
+            'total_expenses': total_expenses,
+            'total_savings': total_savings,
+            'total_investments': total_investments,
+            'net_income': net_income,
+            'average_monthly_income': float(self.df['Income'].mean()),
+            'average_monthly_expenses': float(self.df['Total_Expenses'].mean()),
+            'average_monthly_savings': float(self.df['Savings'].mean()),
+            'savings_rate': actual_savings_rate,
+            'traditional_savings_rate': traditional_savings_rate,
+            'months_in_deficit': int((self._net_income_arr < 0).sum()),
+            'largest_expense_category': str(self._expense_sum_by_cat.idxmax())
+        }
+        self._summary = summary
+        return summary
+
+def generate_financial_advice(data_summary, user_question):
+    """Generate financial advice using Gemini AI"""
+    try:
+        context = f"""
+        Financial Data Summary:
+        - Annual Income: ₹{data_summary['total_income']:,.2f}
+        - Annual Expenses: ₹{data_summary['total_expenses']:,.2f}
+        - Net Income: ₹{data_summary['net_income']:,.2f}
+        - Savings: ₹{data_summary['total_savings']:,.2f}
+        - Investments: ₹{data_summary['total_investments']:,.2f}
+        - Savings Rate: {data_summary['savings_rate']:.1f}%
+        - Months in Deficit: {data_summary['months_in_deficit']}
+        - Largest Expense: {data_summary['largest_expense_category']}
+        
+        Please provide structured, concise financial advice. Format your response as:
+        
+        ## 🎯 **Key Issues**
+        - List 2-3 main problems
+        
+        ## 💡 **Immediate Actions** 
+        - 3-4 specific steps to take now
+        
+        ## 📊 **Budget Recommendations**
+        - Specific expense reduction targets
+        - Income improvement suggestions
+        
+        ## 🎯 **Next Steps**
+        - 2-3 follow-up actions
+        
+        Keep each section brief and actionable. Use bullet points and be specific with amounts and percentages.
+        """
+        
+        prompt = f"{context}\n\nUser Question: {user_question}\n\nPlease provide detailed financial advice and recommendations:"
+        
+        # Reuse the known-healthy model first; only on failure fall back
+        # to probing the preference list again
+        global active_model
+        if active_model is not None:
+            try:
+                return active_model.generate_content(prompt).text
+            except Exception as model_error:
+                print(f"Cached model failed: {str(model_error)}")
+                active_model = None
+
+        for model_name in MODELS_TO_TRY:
+            try:
+                current_model = genai.GenerativeModel(model_name)
+                response = current_model.generate_content(prompt)
+                active_model = current_model
+                return response.text
+            except Exception as model_error:
+                print(f"Model {model_name} failed: {str(model_error)}")
+                continue
+        
+        # If all models fail, return a basic response
+        return f"""## 🎯 **Key Issues**
+- {'Spending ₹' + str(abs(data_summary['net_income'])) + ' more than you earn annually' if data_summary['net_income'] < 0 else 'Living within your means'}
+- {data_summary['months_in_deficit']} months in deficit spending
+- Largest expense: {data_summary['largest_expense_category']}
+
+## 💡 **Immediate Actions**
+- Reduce {data_summary['largest_expense_category']} expenses by 15-20%
+- Create a detailed monthly budget
+- Track every expense for 30 days
+- Look for ways to increase income
+
+## 📊 **Budget Recommendations**
+- Target: Reduce expenses by ₹{abs(data_summary['net_income']) + 10000:,.0f} annually
+- Focus on: {data_summary['largest_expense_category']} optimization
+- Build emergency fund: 3-6 months expenses
+
+## 🎯 **Next Steps**
+- Set up expense tracking app
+- Review and negotiate {data_summary['largest_expense_category']} costs
+- Explore additional income sources
+
+*Note: AI service temporarily unavailable. This is basic guidance based on your data.*"""
+        
+    except Exception as e:
+        return f"Sorry, I encountered an error while generating advice: {str(e)}"
+
+@app.route('/')
+def index():
+    return render_template('index.html')
+
+@app.route('/upload', methods=['POST'])
+def upload_file():
+    if 'file' not in request.files:
+        return jsonify({'error': 'No file uploaded'}), 400
+
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({'error': 'No file selected'}), 400
+
+    if file and file.filename.endswith('.csv'):
+        file_bytes = file.read()
+        file_hash = hashlib.sha256(file_bytes).hexdigest()
+
+        try:
+            entry = dataset_cache.get(file_hash)
+            if entry is None:
+                # New content: persist it and parse once
+                filename = secure_filename(file.filename)
+                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+                with open(filepath, 'wb') as f:
+                    f.write(file_bytes)
+                entry = cache_dataset(file_hash, load_financial_data(filepath))
+            else:
+                # Same content re-uploaded: just reselect the cached entry
+                cache_dataset(file_hash, entry['df'])
+            return jsonify({'message': 'File uploaded successfully', 'rows': len(entry['df'])})
+        except Exception as e:
+            return jsonify({'error': f'Error reading CSV file: {str(e)}'}), 400
+    else:
+        return jsonify({'error': 'Please upload a CSV file'}), 400
+
+# Parts of the /analyze payload in streaming order: the cheap summary
+# goes out first so the client can paint it while charts are computed
+ANALYSIS_PARTS = (
+    ('summary', 'get_financial_summary'),
+    ('income_trend', 'get_income_trend'),
+    ('expense_breakdown', 'get_expense_breakdown'),
+    ('monthly_expenses', 'get_monthly_expenses'),
+    ('savings_analysis', 'get_savings_analysis'),
+    ('net_income_trend', 'get_net_income_trend'),
+)
+
+@app.route('/analyze')
+def analyze_data():
+    entry = get_current_dataset()
+
+    if entry is None:
+        return jsonify({'error': 'No data available. Please upload a CSV file first.'}), 400
+
+    # orjson serializes numpy arrays natively and avoids re-encoding
+    # the chart dicts through jsonify's Python-level encoder
+    if entry['analysis'] is not None:
+        return app.response_class(
+            orjson.dumps(entry['analysis'], option=orjson.OPT_SERIALIZE_NUMPY),
+            mimetype='application/json'
+        )
+
+    def generate():
+        # Stream one JSON document piece by piece: each chart is built
+        # lazily and flushed as soon as it is serialized, so first bytes
+        # are not gated on the slowest figure. The 200 status is already
+        # committed once streaming starts, so failures are reported as an
+        # 'error' member (which the frontend checks for) rather than by
+        # aborting the response mid-document.
+        analyzer = entry['analyzer']
+        analysis = {}
+        for i, (key, method) in enumerate(ANALYSIS_PARTS):
+            try:
+                part = getattr(analyzer, method)()
+            except Exception as e:
+                yield ((b'{' if i == 0 else b',') + b'"error":' +
+                       orjson.dumps(f'Error analyzing data: {str(e)}') + b'}')
+                return
+            analysis[key] = part
+            yield ((b'{' if i == 0 else b',') + orjson.dumps(key) + b':' +
+                   orjson.dumps(part, option=orjson.OPT_SERIALIZE_NUMPY))
+        yield b'}'
+        entry['analysis'] = analysis
+
+    return app.response_class(generate(), mimetype='application/json')
+
+@app.route('/chat', methods=['POST'])
+def chat():
+    entry = get_current_dataset()
+
+    if entry is None:
+        return jsonify({'error': 'No data available. Please upload a CSV file first.'}), 400
+
+    data = request.get_json()
+    user_question = data.get('question', '')
+
+    if not user_question:
+        return jsonify({'error': 'No question provided'}), 400
+
+    try:
+        summary = entry['analyzer'].get_financial_summary()
+        advice = generate_financial_advice(summary, user_question)
+        
+        return jsonify({'response': advice})
+    except Exception as e:
+        return jsonify({'error': f'Error generating response: {str(e)}'}), 500
+
+@app.route('/load_sample')
+def load_sample_data():
+    global sample_dataset_hash
+
+    try:
+        with open('financial_data.csv', 'rb') as f:
+            file_hash = hashlib.sha256(f.read()).hexdigest()
+        sample_dataset_hash = file_hash
+        entry = dataset_cache.get(file_hash)
+        if entry is None:
+            entry = cache_dataset(file_hash, load_financial_data('financial_data.csv'))
+        else:
+            cache_dataset(file_hash, entry['df'])
+        return jsonify({'message': 'Sample data loaded successfully', 'rows': len(entry['df'])})
+    except Exception as e:
+        return jsonify({'error': f'Error loading sample data: {str(e)}'}), 500
+
+if __name__ == '__main__':
+    app.run(debug=True, host='0.0.0.0', port=5000)